@@ -20,7 +20,9 @@ Product Steps
 Steps file for products.feature
 """
 
+from concurrent.futures import ThreadPoolExecutor
 import requests
+from requests.adapters import HTTPAdapter
 from behave import given
 from service.common import status
 
@@ -29,32 +31,47 @@ HTTP_200_OK = status.HTTP_200_OK
 HTTP_201_CREATED = status.HTTP_201_CREATED
 HTTP_204_NO_CONTENT = status.HTTP_204_NO_CONTENT
 
+# Number of requests sent concurrently when loading data
+MAX_WORKERS = 16
+
+# Reuse one keep-alive connection pool for every request
+SESSION = requests.Session()
+SESSION.mount("http://", HTTPAdapter(pool_connections=32, pool_maxsize=32, max_retries=0))
+SESSION.headers["Connection"] = "keep-alive"
+
 @given('the following products')
 def step_impl(context):
     """ Delete all Products and load new ones """
     rest_endpoint = f"{context.base_url}/products"
 
     # Step 1: List all existing products
-    context.resp = requests.get(rest_endpoint)
+    context.resp = SESSION.get(rest_endpoint)
     print(f"GET {rest_endpoint} => {context.resp.status_code}")
     assert context.resp.status_code in [HTTP_200_OK, HTTP_201_CREATED]
 
     # Step 2: Delete all existing products
-    for product in context.resp.json():
-        delete_url = f"{rest_endpoint}/{product['id']}"
-        resp = requests.delete(delete_url)
+    delete_urls = [f"{rest_endpoint}/{product['id']}" for product in context.resp.json()]
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        responses = list(executor.map(SESSION.delete, delete_urls))
+    for delete_url, resp in zip(delete_urls, responses):
         print(f"DELETE {delete_url} => {resp.status_code}")
         assert resp.status_code == HTTP_204_NO_CONTENT
 
     # Step 3: Create new products from the scenario table
-    for row in context.table:
-        data = {
+    rows = [
+        {
             "name": row["name"],
             "description": row["description"],
             "price": float(row["price"]),
             "available": row["available"].lower() == "true",
             "category": row["category"]
         }
-        context.resp = requests.post(rest_endpoint, json=data)
-        print(f"POST {rest_endpoint} => {context.resp.status_code}")
-        assert context.resp.status_code == HTTP_201_CREATED
+        for row in context.table
+    ]
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        responses = list(executor.map(lambda data: SESSION.post(rest_endpoint, json=data), rows))
+    for resp in responses:
+        print(f"POST {rest_endpoint} => {resp.status_code}")
+        assert resp.status_code == HTTP_201_CREATED
+    if responses:
+        context.resp = responses[-1]
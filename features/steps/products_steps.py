@@ -1,94 +1,143 @@
+from functools import lru_cache
 from behave import when, then
 from selenium.webdriver.common.by import By
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.webdriver.support.ui import Select, WebDriverWait
+
+# Negative assertions should fail fast instead of waiting the full timeout
+SHORT_WAIT_SECONDS = 2
+
+BUTTON_MAP = {
+    "Create": "create-btn",
+    "Update": "update-btn",
+    "Delete": "delete-btn",
+    "Retrieve": "retrieve-btn",
+    "Clear": "clear-btn",
+    "Search": "search-btn",
+}
+
+
+@lru_cache(maxsize=None)
+def _fid(field):
+    """Returns the element id of a product form field"""
+    return 'product_' + field.lower().replace(' ', '_')
+
+
+def wait_for(context, locator, cond=EC.presence_of_element_located, timeout=None, message=""):
+    """Waits explicitly for a condition on the element at locator"""
+    return WebDriverWait(
+        context.driver, timeout or context.wait_seconds, poll_frequency=0.2
+    ).until(cond(locator), message)
+
+
+def _set_value(driver, element, value):
+    """Replaces the value of an input field in a single WebDriver call"""
+    driver.execute_script(
+        "arguments[0].value = ''; arguments[0].value = arguments[1]; "
+        "arguments[0].dispatchEvent(new Event('input', {bubbles: true}));",
+        element, value
+    )
+
+
+def _assert_field_value(context, field, expected):
+    """Waits briefly for a form field to hold the expected value"""
+    locator = (By.ID, _fid(field))
+    WebDriverWait(context.driver, SHORT_WAIT_SECONDS, poll_frequency=0.1).until(
+        lambda driver: driver.find_element(*locator).get_attribute('value') == expected,
+        f"Field '{field}' never contained '{expected}'"
+    )
 
 @when('I visit the "{page}"')
 def step_impl(context, page):
     if page == "Home Page":
+        # Pages load with no strategy, so driver.get() returns before the
+        # new document replaces the old one
+        old_page = context.driver.find_element(By.TAG_NAME, 'html')
         context.driver.get(context.base_url)
+        wait = WebDriverWait(context.driver, context.wait_seconds, poll_frequency=0.2)
+        wait.until(EC.staleness_of(old_page), "The Home Page never started loading")
+        # The button handlers are bound in jQuery's ready callback
+        wait.until(
+            lambda driver: driver.execute_script("return document.readyState") == "complete",
+            "The Home Page never finished loading"
+        )
 
 @when('I set the "{field}" to "{value}"')
 def step_impl(context, field, value):
-    field_id = f'product_{field.lower()}'
-    element = context.driver.find_element(By.ID, field_id)
-    element.clear()
-    element.send_keys(value)
+    field_id = _fid(field)
+    element = wait_for(context, (By.ID, field_id))
+    _set_value(context.driver, element, value)
 
 @when('I select "{value}" in the "{field}" dropdown')
 def step_impl(context, value, field):
-    field_id = f'product_{field.lower()}'
-    dropdown = context.driver.find_element(By.ID, field_id)
-    for option in dropdown.find_elements(By.TAG_NAME, 'option'):
-        if option.text == value:
-            option.click()
-            break
+    field_id = _fid(field)
+    dropdown = wait_for(context, (By.ID, field_id))
+    Select(dropdown).select_by_visible_text(value)
 
 @when('I press the "{button}" button')
 def step_impl(context, button):
-    button_map = {
-        "Create": "create-btn",
-        "Update": "update-btn",
-        "Delete": "delete-btn",
-        "Retrieve": "retrieve-btn",
-        "Clear": "clear-btn",
-        "Search": "search-btn",
-    }
-    button_id = button_map.get(button)
-    assert button_id is not None, f"Button '{button}' is not defined in button_map"
-    context.driver.find_element(By.ID, button_id).click()
+    button_id = BUTTON_MAP.get(button)
+    assert button_id is not None, f"Button '{button}' is not defined in BUTTON_MAP"
+    wait_for(context, (By.ID, button_id), EC.element_to_be_clickable).click()
 
 @when('I copy the "{field}" field')
 def step_impl(context, field):
-    field_id = f'product_{field.lower()}'
-    context.clipboard = context.driver.find_element(By.ID, field_id).get_attribute('value')
+    field_id = _fid(field)
+    context.clipboard = wait_for(context, (By.ID, field_id)).get_attribute('value')
 
 @when('I paste the "{field}" field')
 def step_impl(context, field):
-    field_id = f'product_{field.lower()}'
-    element = context.driver.find_element(By.ID, field_id)
-    element.clear()
-    element.send_keys(context.clipboard)
+    field_id = _fid(field)
+    element = wait_for(context, (By.ID, field_id))
+    _set_value(context.driver, element, context.clipboard)
 
 @when('I change "{field}" to "{value}"')
 def step_impl(context, field, value):
-    field_id = f'product_{field.lower()}'
-    element = context.driver.find_element(By.ID, field_id)
-    element.clear()
-    element.send_keys(value)
+    field_id = _fid(field)
+    element = wait_for(context, (By.ID, field_id))
+    _set_value(context.driver, element, value)
 
 @then('I should see the message "{message}"')
 def step_impl(context, message):
-    status_element = context.driver.find_element(By.ID, 'flash_message')
-    assert message in status_element.text
+    wait_for(
+        context, (By.ID, 'flash_message'),
+        lambda locator: EC.text_to_be_present_in_element(locator, message),
+        message=f"Message '{message}' was never shown"
+    )
 
 @then('the "{field}" field should be empty')
 def step_impl(context, field):
-    field_id = f'product_{field.lower()}'
-    element = context.driver.find_element(By.ID, field_id)
+    field_id = _fid(field)
+    element = wait_for(context, (By.ID, field_id), timeout=SHORT_WAIT_SECONDS)
     assert element.get_attribute('value') == ''
 
 @then('the "{field}" field should contain "{value}"')
 @then('I should see "{value}" in the "{field}" field')
 def step_impl(context, value, field):
-    field_id = f'product_{field.lower()}'
-    element = context.driver.find_element(By.ID, field_id)
-    assert element.get_attribute('value') == value
+    _assert_field_value(context, field, value)
 
 @then('I should see "{value}" in the "{field}" dropdown')
 def step_impl(context, value, field):
-    field_id = f'product_{field.lower()}'
-    dropdown = context.driver.find_element(By.ID, field_id)
+    field_id = _fid(field)
+    dropdown = wait_for(context, (By.ID, field_id))
     selected = dropdown.find_element(By.CSS_SELECTOR, 'option:checked')
     assert selected.text == value
 
 @then('I should see "{text}" in the results')
 def step_impl(context, text):
-    table = context.driver.find_element(By.ID, "search_results")
-    assert text in table.text
+    wait_for(
+        context, (By.ID, "search_results"),
+        lambda locator: EC.text_to_be_present_in_element(locator, text),
+        message=f"'{text}' never appeared in the results"
+    )
 
 @then('I should not see "{text}" in the results')
 def step_impl(context, text):
-    table = context.driver.find_element(By.ID, "search_results")
-    assert text not in table.text
+    assert context.driver.execute_script(
+        "const el = document.getElementById('search_results');"
+        "return !el || el.innerText.indexOf(arguments[0]) === -1",
+        text
+    ), f"'{text}' was found in the results"
 
 @then('I should see "Product Catalog Administration" in the title')
 def step_impl(context):
@@ -96,4 +145,6 @@ def step_impl(context):
 
 @then('I should not see "404 Not Found"')
 def step_impl(context):
-    assert "404 Not Found" not in context.driver.page_source
+    assert context.driver.execute_script(
+        "return document.body.innerText.indexOf(arguments[0]) === -1", "404 Not Found"
+    )
@@ -17,9 +17,23 @@
 """
 Test Factory to make fake objects for testing
 """
+from functools import lru_cache
 import factory
 from factory.fuzzy import FuzzyChoice, FuzzyDecimal
-from service.models import Product, Category
+from factory.random import randgen
+from faker import Faker
+from service.models import Product, Category, db
+
+# Faker is slow, so a few descriptions are generated and then reused
+DESCRIPTION_POOL_SIZE = 16
+
+
+@lru_cache(maxsize=None)
+def description_pool() -> tuple:
+    """Generates the descriptions on first use, seeded from factory_boy's random"""
+    fake = Faker()
+    fake.seed_instance(randgen.getrandbits(32))
+    return tuple(fake.text() for _ in range(DESCRIPTION_POOL_SIZE))
 
 class ProductFactory(factory.Factory):
     """Creates fake products for testing"""
@@ -31,10 +45,20 @@ class ProductFactory(factory.Factory):
         "Hat", "Pants", "Shirt", "Apple", "Banana", "Pots",
         "Towels", "Ford", "Chevy", "Hammer", "Wrench"
     ])
-    description = factory.Faker("text")
+    description = factory.LazyFunction(lambda: randgen.choice(description_pool()))
     price = FuzzyDecimal(0.5, 2000.0, 2)
     available = FuzzyChoice(choices=[True, False])
     category = FuzzyChoice(choices=[
         Category.UNKNOWN, Category.CLOTHS, Category.FOOD,
         Category.HOUSEWARES, Category.AUTOMOTIVE, Category.TOOLS
     ])
+
+
+def create_products(count: int = 1) -> list:
+    """Saves a batch of fake products with a single commit"""
+    products = ProductFactory.create_batch(count)
+    for product in products:
+        product.id = None  # must be None to auto-generate
+    db.session.add_all(products)
+    db.session.commit()
+    return products
@@ -1,36 +1,18 @@
-import os
-import logging
 import unittest
 from decimal import Decimal
+import pytest
 from service.models import Product, Category, DataValidationError, db
-from service import app
-from tests.factories import ProductFactory
-
-DATABASE_URI = os.getenv("DATABASE_URI", "sqlite:///:memory:")
+from tests.factories import ProductFactory, create_products
 
 
+@pytest.mark.usefixtures("db_savepoint")
 class TestProductModel(unittest.TestCase):
     """Test Cases for Product Model"""
 
-    @classmethod
-    def setUpClass(cls):
-        app.config["TESTING"] = True
-        app.config["DEBUG"] = False
-        app.config["SQLALCHEMY_DATABASE_URI"] = DATABASE_URI
-        app.logger.setLevel(logging.CRITICAL)
-        Product.init_db(app)
-
     @classmethod
     def tearDownClass(cls):
         db.session.close()
 
-    def setUp(self):
-        db.session.query(Product).delete()
-        db.session.commit()
-
-    def tearDown(self):
-        db.session.remove()
-
     def test_create_a_product(self):
         """It should Create a product and assert that it exists"""
         product = Product(
@@ -137,17 +119,13 @@ class TestProductModel(unittest.TestCase):
         """It should List all Products in the database"""
         products = Product.all()
         self.assertEqual(products, [])
-        for _ in range(5):
-            product = ProductFactory()
-            product.create()
+        create_products(5)
         products = Product.all()
         self.assertEqual(len(products), 5)
 
     def test_find_by_name(self):
         """It should Find a Product by Name"""
-        products = ProductFactory.create_batch(5)
-        for product in products:
-            product.create()
+        products = create_products(5)
         name = products[0].name
         expected = len([p for p in products if p.name == name])
         found = Product.find_by_name(name)
@@ -157,9 +135,7 @@ class TestProductModel(unittest.TestCase):
 
     def test_find_by_availability(self):
         """It should Find Products by Availability"""
-        products = ProductFactory.create_batch(10)
-        for product in products:
-            product.create()
+        products = create_products(10)
         available = products[0].available
         expected = len([p for p in products if p.available == available])
         found = Product.find_by_availability(available)
@@ -169,9 +145,7 @@ class TestProductModel(unittest.TestCase):
 
     def test_find_by_category(self):
         """It should Find Products by Category"""
-        products = ProductFactory.create_batch(10)
-        for product in products:
-            product.create()
+        products = create_products(10)
         category = products[0].category
         expected = len([p for p in products if p.category == category])
         found = Product.find_by_category(category)